@@ -3,15 +3,312 @@ Database Manager for Medical Claim Adjudication System
 Uses Supabase REST API - works anywhere, no network issues
 """
 import os
+import copy
+import logging
+import threading
+import time
+import atexit
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import json
 
+logger = logging.getLogger(__name__)
+
+
+# Shared threads for pipelined writes - one pool for the process rather than one per flush
+_WRITE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('WRITE_PIPELINE_WORKERS', '16')),
+    thread_name_prefix='db-write'
+)
+
+
+class WritePipeline:
+    """Independent writes queued with add() and sent together by flush()"""
+    
+    def __init__(self):
+        self._calls = []
+    
+    def add(self, fn, *args, **kwargs):
+        """Queue a DatabaseManager call"""
+        self._calls.append((fn, args, kwargs))
+    
+    def send(self) -> List[Optional[Exception]]:
+        """Send all queued calls concurrently; returns each call's exception, or None if it succeeded"""
+        calls, self._calls = self._calls, []
+        if len(calls) <= 1:
+            errors = []
+            for fn, args, kwargs in calls:
+                try:
+                    fn(*args, **kwargs)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+            return errors
+        
+        futures = [_WRITE_EXECUTOR.submit(fn, *args, **kwargs) for fn, args, kwargs in calls]
+        return [future.exception() for future in futures]
+    
+    def flush(self):
+        """Send all queued calls concurrently, re-raising the first failure"""
+        for error in self.send():
+            if error is not None:
+                raise error
+
+
+class DecisionWrites:
+    """
+    Post-decision writes for one or more claims. Claim updates are sent concurrently, then
+    the approved amounts of the ones that saved are summed per policy, so each policy's
+    claims_ytd is updated once and never counts a decision that wasn't written.
+    
+    Until flushed, approved amounts are not in the database, so claims sharing a policy
+    should hold policy_lock(policy_id) from reading its utilization until add(), and count
+    pending_approved(policy_id) toward it. That covers every queued decision's approved_amount
+    (PARTIAL and MANUAL_REVIEW included, as utilization sums claims.approved_amount), while
+    claims_ytd only grows by APPROVED amounts
+    """
+    
+    def __init__(self, db: 'DatabaseManager'):
+        self._db = db
+        self._decisions = []
+        self._ytd_claims = {}
+        self._pending_util = {}
+        self._policy_locks = {}
+        self._lock = threading.Lock()
+    
+    def policy_lock(self, policy_id: str) -> threading.Lock:
+        """Lock serializing the limit check and decision of claims on one policy"""
+        with self._lock:
+            return self._policy_locks.setdefault(policy_id, threading.Lock())
+    
+    def pending_approved(self, policy_id: str) -> float:
+        """Approved amount queued for a policy, whatever the decision, but not yet written"""
+        with self._lock:
+            return self._pending_util.get(policy_id, 0)
+    
+    def add(self, claim_id: str, decision_data: Dict, policy_id: str = None):
+        """Queue a claim's decision; an approved amount also counts toward its policy's YTD"""
+        with self._lock:
+            self._decisions.append((claim_id, decision_data))
+            if policy_id:
+                self._pending_util[policy_id] = (self._pending_util.get(policy_id, 0)
+                                                 + (decision_data.get('approved_amount') or 0))
+            if policy_id and decision_data['decision'] == 'APPROVED':
+                self._ytd_claims.setdefault(policy_id, []).append((claim_id, decision_data['approved_amount']))
+    
+    def send(self) -> Dict[str, Exception]:
+        """
+        Send everything queued so far. Returns {claim_id: error} for claims whose decision
+        update, or whose policy's claims_ytd update, failed - empty when all succeeded
+        """
+        with self._lock:
+            decisions, self._decisions = self._decisions, []
+            ytd_claims, self._ytd_claims = self._ytd_claims, {}
+            self._pending_util = {}
+        
+        # Decisions first - claims_ytd only grows by amounts whose decision was saved
+        pipe = WritePipeline()
+        for claim_id, decision_data in decisions:
+            pipe.add(self._db.update_claim_decision, claim_id, decision_data)
+        failed = {
+            claim_id: error
+            for (claim_id, _), error in zip(decisions, pipe.send())
+            if error is not None
+        }
+        
+        ytd_updates = []
+        for policy_id, claims in ytd_claims.items():
+            saved = [(claim_id, amount) for claim_id, amount in claims if claim_id not in failed]
+            if saved:
+                ytd_updates.append(saved)
+                pipe.add(self._db.update_policy_claims_ytd, policy_id, sum(amount for _, amount in saved))
+        for saved, error in zip(ytd_updates, pipe.send()):
+            if error is not None:
+                for claim_id, _ in saved:
+                    failed[claim_id] = error
+        return failed
+    
+    def flush(self):
+        """Send everything queued so far, re-raising the first failure"""
+        failed = self.send()
+        if failed:
+            raise next(iter(failed.values()))
+
+
+class AuditBuffer:
+    """
+    Audit log rows held in memory and written with one bulk insert per batch - when
+    batch_size rows are waiting, every flush_interval seconds, and at exit. Only flush()
+    raises; append() never fails the caller over a backlog of other claims' rows
+    """
+    
+    # A batch that fails this many flushes in a row is dropped so it can't block later rows
+    MAX_RETRIES = int(os.getenv('AUDIT_MAX_RETRIES', '3'))
+    
+    # Most rows held while inserts are failing; the oldest are dropped beyond this
+    MAX_ROWS = int(os.getenv('AUDIT_MAX_ROWS', '10000'))
+    
+    def __init__(self, api_url: str, headers: Dict, batch_size: int, flush_interval: float):
+        self.url = f"{api_url}/audit_log"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._rows = []
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        
+        # Own session - the buffer outlives the per-request managers that append to it
+        self._session = requests.Session()
+        self._session.headers.update(headers)
+        
+        if flush_interval > 0:
+            threading.Thread(target=self._flush_periodically, name='audit-flush', daemon=True).start()
+        atexit.register(self.flush)
+    
+    def append(self, claim_id: str, action: str, performed_by: str = 'system', details: Dict = None):
+        """Queue an audit entry, stamped now so its order survives the delayed insert"""
+        row = {
+            'claim_id': claim_id,
+            'action': action,
+            'performed_by': performed_by,
+            'details': details or {},
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }
+        with self._lock:
+            self._rows.append(row)
+            self._trim()
+            full = len(self._rows) >= self.batch_size
+        if full:
+            if self.flush_interval > 0:
+                # Hand the write to the background flusher rather than this claim's thread
+                self._wake.set()
+            else:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.warning("Audit log flush failed: %s", e)
+    
+    def _trim(self):
+        """Drop the oldest entries beyond MAX_ROWS (call with _lock held)"""
+        overflow = len(self._rows) - self.MAX_ROWS
+        if overflow > 0:
+            del self._rows[:overflow]
+            logger.error("Audit log buffer full, dropped %s oldest entries", overflow)
+    
+    def flush(self):
+        """
+        Write every queued entry now. A failed batch stays queued for the next flush until
+        it has failed MAX_RETRIES times, then it is dropped
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                try:
+                    response = self._session.post(self.url, json=batch)
+                    response.raise_for_status()
+                    self._failures = 0
+                except Exception:
+                    self._failures += 1
+                    remaining = rows[start:]
+                    if self._failures >= self.MAX_RETRIES:
+                        # PostgREST rejects the whole batch for one bad row - drop it and move on
+                        logger.error(
+                            "Audit log insert failed %s times, dropping %s entries for claims %s",
+                            self._failures, len(batch), sorted({row['claim_id'] for row in batch})[:10]
+                        )
+                        self._failures = 0
+                        remaining = rows[start + self.batch_size:]
+                    with self._lock:
+                        self._rows[:0] = remaining
+                        self._trim()
+                    raise
+    
+    def _flush_periodically(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning("Audit log flush failed: %s", e)
+                # Back off a full interval so a full buffer doesn't retry on every append
+                time.sleep(self.flush_interval)
+
+
+_AUDIT_BUFFER = None
+_AUDIT_BUFFER_LOCK = threading.Lock()
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after ttl seconds. With copy_values,
+    values are deep-copied in and out so callers can't mutate the cached copy
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, copy_values: bool = False):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.copy_values = copy_values
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Cached value or None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return copy.deepcopy(value) if self.copy_values else value
+    
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        if self.copy_values:
+            value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def discard_where(self, predicate):
+        """Drop every entry for which predicate(key, value) is true"""
+        with self._lock:
+            for key in [k for k, (_, value) in self._data.items() if predicate(k, value)]:
+                del self._data[key]
+
+
+# Lookup cache keys holding policy rows (the rest hold member rows, which also carry policy_id)
+_POLICY_CACHE_KEYS = frozenset({'policy', 'policy_number'})
+
+# Policies and members are read on every claim but rarely change - shared by all managers.
+# Only claims_ytd updates made here invalidate entries; policy status, dates and config
+# edited elsewhere can be served stale for up to DB_CACHE_TTL seconds
+_LOOKUP_CACHE = TTLCache(
+    maxsize=int(os.getenv('DB_CACHE_SIZE', '128')),
+    ttl=float(os.getenv('DB_CACHE_TTL', '60')),
+    copy_values=True
+)
+
 
 class DatabaseManager:
     """Manages all database operations using Supabase REST API"""
     
+    # Max ids per PostgREST in.() filter, keeps the query string well under URL limits
+    IN_FILTER_CHUNK = 100
+    
     def __init__(self):
         """Initialize Supabase REST API client"""
         self.supabase_url = os.getenv('SUPABASE_URL')
@@ -35,11 +332,16 @@ class DatabaseManager:
             'Prefer': 'return=representation'
         }
         
+        # Keep-alive sessions, one per thread - requests.Session isn't documented as thread-safe,
+        # and pipelined writes call this manager from several threads at once
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        
         # Test connection
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/policies",
-                headers=self.headers,
                 params={'limit': 1},
                 timeout=10
             )
@@ -54,26 +356,48 @@ class DatabaseManager:
                 f"Original error: {e}"
             )
     
+    @property
+    def session(self) -> requests.Session:
+        """This thread's HTTP session, created on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+    
     def _get(self, table: str, params: Dict = None) -> List[Dict]:
         """Generic GET request"""
         url = f"{self.api_url}/{table}"
-        response = requests.get(url, headers=self.headers, params=params or {})
+        response = self.session.get(url, params=params or {})
         response.raise_for_status()
         return response.json()
     
     def _post(self, table: str, data: Dict) -> Dict:
         """Generic POST request"""
         url = f"{self.api_url}/{table}"
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.session.post(url, json=data)
         response.raise_for_status()
         result = response.json()
         return result[0] if isinstance(result, list) and result else result
     
+    def _post_many(self, table: str, rows: List[Dict]) -> List[Dict]:
+        """Bulk POST request - inserts all rows in one round-trip (rows must share the same keys)"""
+        if not rows:
+            return []
+        url = f"{self.api_url}/{table}"
+        response = self.session.post(url, json=rows)
+        response.raise_for_status()
+        result = response.json()
+        return result if isinstance(result, list) else [result]
+    
     def _patch(self, table: str, data: Dict, filter_params: Dict) -> Dict:
         """Generic PATCH request"""
         url = f"{self.api_url}/{table}"
         params = {f"{k}": f"eq.{v}" for k, v in filter_params.items()}
-        response = requests.patch(url, headers=self.headers, json=data, params=params)
+        response = self.session.patch(url, json=data, params=params)
         response.raise_for_status()
         result = response.json()
         return result[0] if isinstance(result, list) and result else result
@@ -82,14 +406,28 @@ class DatabaseManager:
         """Generic DELETE request"""
         url = f"{self.api_url}/{table}"
         params = {f"{k}": f"eq.{v}" for k, v in filter_params.items()}
-        response = requests.delete(url, headers=self.headers, params=params)
+        response = self.session.delete(url, params=params)
         response.raise_for_status()
         return True
     
     # ==================== POLICY OPERATIONS ====================
     
+    def _cached_lookup(self, key: tuple, fetch) -> Optional[Dict]:
+        """Return a recent row for key from the lookup cache, fetching it on a miss"""
+        row = _LOOKUP_CACHE.get(key)
+        if row is None:
+            row = fetch()
+            # Misses aren't cached - the row may be created moments later
+            if row is not None:
+                _LOOKUP_CACHE.set(key, row)
+        return row
+    
     def get_policy(self, policy_id: str) -> Optional[Dict]:
         """Get policy by ID"""
+        return self._cached_lookup(('policy', policy_id), lambda: self._fetch_policy(policy_id))
+    
+    def _fetch_policy(self, policy_id: str) -> Optional[Dict]:
+        """Get policy by ID straight from the database"""
         try:
             result = self._get('policies', {'policy_id': f'eq.{policy_id}'})
             return result[0] if result else None
@@ -111,16 +449,22 @@ class DatabaseManager:
     
     def get_member(self, member_id: str) -> Optional[Dict]:
         """Get member by ID"""
-        try:
-            result = self._get('covered_members', {'member_id': f'eq.{member_id}'})
-            return result[0] if result else None
-        except:
-            return None
+        return self._cached_lookup(
+            ('member', member_id),
+            lambda: self._get_first('covered_members', {'member_id': f'eq.{member_id}'})
+        )
     
     def get_member_by_employee_id(self, employee_id: str) -> Optional[Dict]:
         """Get member by employee ID"""
+        return self._cached_lookup(
+            ('employee', employee_id),
+            lambda: self._get_first('covered_members', {'employee_id': f'eq.{employee_id}'})
+        )
+    
+    def _get_first(self, table: str, params: Dict) -> Optional[Dict]:
+        """First matching row, or None on no match or error"""
         try:
-            result = self._get('covered_members', {'employee_id': f'eq.{employee_id}'})
+            result = self._get(table, params)
             return result[0] if result else None
         except:
             return None
@@ -252,8 +596,8 @@ class DatabaseManager:
     
     def create_claim_items(self, claim_id: str, items: List[Dict]):
         """Create claim items in bulk"""
-        for item in items:
-            data = {
+        rows = [
+            {
                 'claim_id': claim_id,
                 'description': item['description'],
                 'category': item['category'],
@@ -267,7 +611,9 @@ class DatabaseManager:
                 'coverage_reason': item['reason'],
                 'sub_limit_exceeded': item.get('sub_limit_exceeded', False)
             }
-            self._post('claim_items', data)
+            for item in items
+        ]
+        self._post_many('claim_items', rows)
     
     # ==================== ISSUES OPERATIONS ====================
     
@@ -276,8 +622,8 @@ class DatabaseManager:
         if not issues:
             return
         
-        for issue in issues:
-            data = {
+        rows = [
+            {
                 'claim_id': claim_id,
                 'issue_code': issue['code'],
                 'severity': issue['severity'],
@@ -285,7 +631,9 @@ class DatabaseManager:
                 'step': issue.get('step'),
                 'item_description': issue.get('item')
             }
-            self._post('adjudication_issues', data)
+            for issue in issues
+        ]
+        self._post_many('adjudication_issues', rows)
     
     def get_claim_issues(self, claim_id: str) -> List[Dict]:
         """Get all issues for a claim"""
@@ -302,27 +650,39 @@ class DatabaseManager:
         if not indicators:
             return
         
-        for indicator in indicators:
-            data = {
+        rows = [
+            {
                 'claim_id': claim_id,
                 'indicator_type': indicator['type'],
                 'severity': indicator['severity'],
                 'message': indicator['message'],
                 'score': indicator['score']
             }
-            self._post('fraud_indicators', data)
+            for indicator in indicators
+        ]
+        self._post_many('fraud_indicators', rows)
     
     # ==================== AUDIT LOG OPERATIONS ====================
     
+    @property
+    def audit_buffer(self) -> AuditBuffer:
+        """Process-wide audit buffer, created on first use"""
+        global _AUDIT_BUFFER
+        with _AUDIT_BUFFER_LOCK:
+            if _AUDIT_BUFFER is None:
+                _AUDIT_BUFFER = AuditBuffer(
+                    self.api_url,
+                    self.headers,
+                    batch_size=int(os.getenv('AUDIT_BATCH_SIZE', '500')),
+                    flush_interval=float(os.getenv('AUDIT_FLUSH_INTERVAL', '5'))
+                )
+            return _AUDIT_BUFFER
+    
     def log_audit(self, claim_id: str, action: str, performed_by: str = 'system', details: Dict = None):
-        """Create audit log entry"""
-        data = {
-            'claim_id': claim_id,
-            'action': action,
-            'performed_by': performed_by,
-            'details': details or {}
-        }
-        self._post('audit_log', data)
+        """Create audit log entry immediately (along with any buffered entries)"""
+        buffer = self.audit_buffer
+        buffer.append(claim_id, action, performed_by, details)
+        buffer.flush()
     
     def get_claim_audit_log(self, claim_id: str) -> List[Dict]:
         """Get audit log for a claim"""
@@ -334,9 +694,10 @@ class DatabaseManager:
     
     # ==================== DOCUMENT UPLOADS OPERATIONS ====================
     
-    def create_document_upload(self, claim_id: str, file_data: Dict) -> str:
-        """Record document upload"""
-        data = {
+    @staticmethod
+    def _document_upload_row(claim_id: str, file_data: Dict) -> Dict:
+        """Row for the document_uploads table"""
+        return {
             'claim_id': claim_id,
             'file_name': file_data['file_name'],
             'file_type': file_data['file_type'],
@@ -345,9 +706,17 @@ class DatabaseManager:
             'storage_url': file_data.get('storage_url'),
             'document_type': file_data.get('document_type', 'general')
         }
-        result = self._post('document_uploads', data)
+    
+    def create_document_upload(self, claim_id: str, file_data: Dict) -> str:
+        """Record document upload"""
+        result = self._post('document_uploads', self._document_upload_row(claim_id, file_data))
         return str(result['id'])
     
+    def create_document_uploads(self, claim_id: str, files: List[Dict]) -> List[str]:
+        """Record several document uploads in one request"""
+        rows = [self._document_upload_row(claim_id, file_data) for file_data in files]
+        return [str(result['id']) for result in self._post_many('document_uploads', rows)]
+    
     def get_claim_documents_by_type(self, claim_id: str, doc_type: str = None) -> List[Dict]:
         """Get documents for a claim, optionally filtered by type"""
         params = {'claim_id': f'eq.{claim_id}'}
@@ -396,8 +765,8 @@ class DatabaseManager:
     
     def update_policy_claims_ytd(self, policy_id: str, amount: float):
         """Update policy year-to-date claims amount"""
-        # Get current policy
-        policy = self.get_policy(policy_id)
+        # Get current policy - uncached, the increment must start from the stored value
+        policy = self._fetch_policy(policy_id)
         if not policy:
             return
         
@@ -405,9 +774,19 @@ class DatabaseManager:
         new_ytd = current_ytd + amount
         
         self._patch('policies', {'claims_ytd': new_ytd}, {'policy_id': policy_id})
+        _LOOKUP_CACHE.discard_where(
+            lambda key, row: key[0] in _POLICY_CACHE_KEYS and row.get('policy_id') == policy_id
+        )
     
     def get_policy_by_number(self, policy_number: str) -> Optional[Dict]:
         """Get policy by policy number"""
+        return self._cached_lookup(
+            ('policy_number', policy_number),
+            lambda: self._fetch_policy_by_number(policy_number)
+        )
+    
+    def _fetch_policy_by_number(self, policy_number: str) -> Optional[Dict]:
+        """Get policy by policy number straight from the database"""
         try:
             # Try direct match
             result = self._get('policies', {'policy_id': f'eq.{policy_number}'})
@@ -445,11 +824,15 @@ class DatabaseManager:
             total_approved = sum(c.get('approved_amount', 0) or 0 for c in claims)
             total_claims = len(claims)
             
-            # Get category usage
+            # Get category usage - one in.() query per chunk of claims instead of one per claim
             category_usage = {}
-            for claim in claims:
-                claim_id = claim['claim_id']
-                items = self._get('claim_items', {'claim_id': f'eq.{claim_id}'})
+            claim_ids = [c['claim_id'] for c in claims]
+            for start in range(0, len(claim_ids), self.IN_FILTER_CHUNK):
+                chunk = claim_ids[start:start + self.IN_FILTER_CHUNK]
+                items = self._get('claim_items', {
+                    'claim_id': f'in.({",".join(chunk)})',
+                    'select': 'category,approved_amount'
+                })
                 
                 for item in items:
                     category = item.get('category', 'unknown')
@@ -468,6 +851,31 @@ class DatabaseManager:
         except:
             return None
     
+    def get_claim_context(self, policy_id: str = None, member_id: str = None) -> Dict:
+        """Fetch everything adjudication needs about a policy and member up front"""
+        return {
+            'member': self.get_member(member_id) if member_id else None,
+            'policy_utilization': self.get_policy_utilization(policy_id) if policy_id else None
+        }
+    
+    @contextmanager
+    def pipeline(self):
+        """
+        Queue independent writes with pipe.add(fn, ...) and send them concurrently when the
+        block exits. Nothing is sent if the block raises. Not a transaction - PostgREST
+        applies each request on its own.
+        """
+        pipe = WritePipeline()
+        yield pipe
+        pipe.flush()
+    
+    def decision_writes(self) -> DecisionWrites:
+        """New collector for post-decision writes, sent with its flush()"""
+        return DecisionWrites(self)
+    
     def close(self):
-        """Close connections (no-op for REST API)"""
-        pass
\ No newline at end of file
+        """Close every HTTP session this manager opened"""
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
\ No newline at end of file
@@ -7,8 +7,15 @@ Requirements:
 pip install reportlab pillow numpy
 """
 
+import os
+import pickle
 import random
+import sys
+import threading
+import traceback
 from datetime import datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from reportlab.lib import colors
@@ -16,12 +23,188 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from reportlab.pdfgen import canvas
-from PIL import Image as PILImage, ImageDraw, ImageFont, ImageFilter
 import io
 import numpy as np
 
+# PIL is only needed for noise/handwriting rasterization, so it is imported lazily
+
+# Directories already created in this process - skips repeat makedirs/stat calls
+_ENSURED_DIRS: set[str] = set()
+
+def _ensure_dir(path):
+    """Create a directory once per process"""
+    if path in _ENSURED_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ENSURED_DIRS.add(path)
+
+# Lab panel bounds as (low, high) arrays so each panel is drawn in a single vectorized call
+_PANEL_BOUNDS = {
+    # Hemoglobin, WBC, RBC, Platelets
+    'cbc': (np.array([12, 4000, 4.5, 150000]), np.array([16, 11001, 5.5, 450001])),
+    # Total cholesterol, HDL, LDL, Triglycerides
+    'lipid': (np.array([150, 40, 70, 80]), np.array([241, 61, 161, 181])),
+    # Fasting blood sugar
+    'sugar': (np.array([80]), np.array([127])),
+}
+
+class _TemplatePool:
+    """Per-thread SimpleDocTemplate reuse - each thread keeps one template and rebinds its output"""
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    def acquire(self, filename):
+        doc = getattr(self._local, 'doc', None)
+        if doc is None:
+            # Compressed content streams shrink the files; invariant output is byte-stable for identical stories
+            doc = SimpleDocTemplate(filename, pagesize=A4, pageCompression=1, invariant=1)
+            self._local.doc = doc
+        else:
+            # build() appends fresh page templates on every call, so drop the previous document's
+            doc.filename = filename
+            doc.pageTemplates = []
+        return doc
+
+_TEMPLATE_POOL = _TemplatePool()
+
+def _render(story):
+    """Render a prepared story to PDF bytes in memory"""
+    buf = io.BytesIO()
+    _TEMPLATE_POOL.acquire(buf).build(story)
+    return buf.getvalue()
+
+def _build_one(path, story):
+    """Render a prepared story, then write the PDF file in one call"""
+    Path(path).write_bytes(_render(story))
+
+def _write_files(directory, files):
+    """Write several (path, bytes) pairs back to back, then flush the directory once"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    for path, data in files:
+        fd = os.open(path, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    
+    # Directory fsync makes the new entries durable; not supported on every platform
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+# Colors - HexColor parsing and attribute lookups done once at import
+_NAVY = colors.HexColor('#2c3e50')
+_BLUE = colors.HexColor('#1a5490')
+_TEAL = colors.HexColor('#16a085')
+_HEADER_BG = colors.grey
+_TOTAL_BG = colors.beige
+_LAB_HEADER_BG = colors.lightblue
+_WHITESMOKE = colors.whitesmoke
+_BLACK = colors.black
+
+# Table style commands - the relative -1/-3/-4 row indices hold for any row count, so one
+# TableStyle per layout is built at import and shared by every document
+_BILL_TABLE_STYLE_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), _HEADER_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 0), _WHITESMOKE),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (1, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, -1), (-1, -1), _TOTAL_BG),
+    ('GRID', (0, 0), (-1, -4), 1, _BLACK),
+    ('LINEABOVE', (1, -3), (-1, -3), 1, _BLACK),
+    ('LINEABOVE', (1, -1), (-1, -1), 2, _BLACK),
+]
+_BILL_TABLE_STYLE = TableStyle(_BILL_TABLE_STYLE_CMDS)
+
+_CBC_TABLE_STYLE_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), _LAB_HEADER_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 0), _BLACK),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, _BLACK),
+]
+_CBC_TABLE_STYLE = TableStyle(_CBC_TABLE_STYLE_CMDS)
+
+_LAB_TABLE_STYLE_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), _LAB_HEADER_BG),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, _BLACK),
+]
+_LAB_TABLE_STYLE = TableStyle(_LAB_TABLE_STYLE_CMDS)
+
+_CLAIMANT_BILL_TABLE_STYLE_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), _HEADER_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 0), _WHITESMOKE),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (1, -1), (-1, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -4), 1, _BLACK),
+    ('LINEABOVE', (1, -3), (-1, -3), 1, _BLACK),
+    ('LINEABOVE', (1, -1), (-1, -1), 2, _BLACK),
+    ('BACKGROUND', (0, -1), (-1, -1), _TOTAL_BG),
+]
+_CLAIMANT_BILL_TABLE_STYLE = TableStyle(_CLAIMANT_BILL_TABLE_STYLE_CMDS)
+
+# Pharmacy grid height depends on the number of medicines, so only the fixed commands are shared
+_PHARMACY_TABLE_STYLE_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), _TEAL),
+    ('TEXTCOLOR', (0, 0), (-1, 0), _WHITESMOKE),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+    ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (5, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, -1), (-1, -1), _TOTAL_BG),
+]
+_PHARMACY_TOTAL_LINE_CMDS = [
+    ('LINEABOVE', (5, -5), (-1, -5), 1, _BLACK),
+    ('LINEABOVE', (5, -1), (-1, -1), 2, _BLACK),
+]
+
+# Bill paragraph markup - only the values change between documents. Paragraph objects themselves
+# are not reused since they hold per-build layout state.
+_BILL_NO_TEMPLATE = 'Bill No: <b>{}{}</b>  |  Date: <b>{}</b>'
+_PATIENT_NAME_TEMPLATE = '<b>Patient Name:</b> {}'
+_CONTACT_TEMPLATE = '<b>Contact:</b> {}'
+_PAYMENT_MODE_TEMPLATE = '<b>Payment Mode:</b> {}'
+_TRANSACTION_ID_TEMPLATE = '<b>Transaction ID:</b> {}'
+
 # Sample Data
-STATES = ['KA', 'MH', 'DL', 'TN', 'UP', 'WB', 'GJ', 'RJ']
+STATES = ('KA', 'MH', 'DL', 'TN', 'UP', 'WB', 'GJ', 'RJ')
+
+# Sampling pools for random.choice - module-level tuples instead of per-call list literals
+_SEXES = ('M', 'F')
+_STREETS = ('MG Road', 'Park Street', 'Nehru Nagar')
+_CITIES = ('Mumbai', 'Delhi', 'Bangalore')
+_DURATIONS = ('5 days', '7 days', '10 days', '14 days')
+_CLINIC_NAMES = ('City Hospital', 'HealthCare Clinic', 'MediPlus Hospital')
+_CONSULTATION_FEES = (500, 700, 1000, 1500)
+_PAYMENT_MODES = ('Cash', 'Card', 'UPI')
+_PHARMACY_NAMES = ('MedPlus Pharmacy', 'Apollo Pharmacy', 'NetMeds Retail')
+_PHARMACY_PAYMENT_MODES = ('Cash', 'Card', 'UPI', 'Digital Wallet')
+_PHARMACY_DISCOUNTS = (0, 0.05, 0.10)
+_BATCH_PREFIXES = ('AB', 'CD', 'XY')
 DOCTORS = [
     {'name': 'Dr. Rajesh Kumar', 'qualification': 'MBBS, MD (Medicine)', 'specialty': 'General Medicine'},
     {'name': 'Dr. Priya Sharma', 'qualification': 'MBBS, MS (Surgery)', 'specialty': 'Surgery'},
@@ -63,102 +246,134 @@ PATIENT_NAMES = ['Ramesh Singh', 'Anjali Desai', 'Vikram Reddy', 'Pooja Iyer', '
 class MedicalDocumentGenerator:
     def __init__(self, output_dir='generated_docs'):
         self.output_dir = output_dir
-        import os
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir)
+        
+        # Stylesheet and header styles are built once per generator and shared by every document
+        self._styles = getSampleStyleSheet()
+        self._prescription_header_style = ParagraphStyle(
+            'CustomHeader',
+            parent=self._styles['Heading1'],
+            fontSize=16,
+            textColor=_BLUE,
+            spaceAfter=12,
+            alignment=TA_CENTER
+        )
+        self._bill_header_style = ParagraphStyle(
+            'BillHeader',
+            parent=self._styles['Heading1'],
+            fontSize=18,
+            textColor=_NAVY,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        self._pharmacy_header_style = ParagraphStyle(
+            'PharmacyHeader',
+            parent=self._styles['Heading1'],
+            fontSize=18,
+            textColor=_TEAL,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        
+        # Per-instance generators: random.Random for picks from the sample pools, PCG64 for numeric draws
+        # (quantities, lab values, ids). Both seed from OS entropy, so each worker process is independent.
+        self._random = random.Random()
+        self._rng = np.random.default_rng()
     
     def generate_random_patient(self):
         """Generate random patient details"""
         return {
-            'name': random.choice(PATIENT_NAMES),
-            'age': random.randint(18, 75),
-            'sex': random.choice(['M', 'F']),
-            'contact': f'+91 {random.randint(7000000000, 9999999999)}',
-            'address': f'{random.randint(1, 999)}, {random.choice(["MG Road", "Park Street", "Nehru Nagar"])}, {random.choice(["Mumbai", "Delhi", "Bangalore"])}'
+            'name': self._random.choice(PATIENT_NAMES),
+            'age': self._random.randint(18, 75),
+            'sex': self._random.choice(_SEXES),
+            'contact': f'+91 {self._random.randint(7000000000, 9999999999)}',
+            'address': f'{self._random.randint(1, 999)}, {self._random.choice(_STREETS)}, {self._random.choice(_CITIES)}'
         }
     
     def generate_registration_number(self):
         """Generate doctor registration number"""
-        state = random.choice(STATES)
-        number = random.randint(10000, 99999)
-        year = random.randint(2010, 2023)
+        state = self._random.choice(STATES)
+        number = self._random.randint(10000, 99999)
+        year = self._random.randint(2010, 2023)
         return f'{state}/{number}/{year}'
     
+    def _draw_panel(self, panel):
+        """Draw one set of lab values for a panel ('cbc' is continuous, the rest integer)"""
+        low, high = _PANEL_BOUNDS[panel]
+        if panel == 'cbc':
+            return self._rng.uniform(low, high).tolist()
+        return self._rng.integers(low, high).tolist()
+    
     def generate_prescription(self, filename='prescription.pdf', add_noise=False):
         """Generate a medical prescription"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
+        h2 = styles['Heading2']
         
         # Header Style
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a5490'),
-            spaceAfter=12,
-            alignment=TA_CENTER
-        )
+        header_style = self._prescription_header_style
         
         # Select doctor
-        doctor = random.choice(DOCTORS)
+        doctor = self._random.choice(DOCTORS)
         patient = self.generate_random_patient()
         reg_no = self.generate_registration_number()
         
         # Header
         story.append(Paragraph(f"<b>{doctor['name']}</b>", header_style))
-        story.append(Paragraph(doctor['qualification'], styles['Normal']))
-        story.append(Paragraph(f"Reg. No: {reg_no}", styles['Normal']))
-        story.append(Paragraph(f"Specialty: {doctor['specialty']}", styles['Normal']))
+        story.append(Paragraph(doctor['qualification'], normal))
+        story.append(Paragraph(f"Reg. No: {reg_no}", normal))
+        story.append(Paragraph(f"Specialty: {doctor['specialty']}", normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Date
-        date = datetime.now() - timedelta(days=random.randint(0, 30))
-        story.append(Paragraph(f"Date: {date.strftime('%d/%m/%Y')}", styles['Normal']))
+        date = datetime.now() - timedelta(days=self._random.randint(0, 30))
+        story.append(Paragraph(f"Date: {date.strftime('%d/%m/%Y')}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Patient Details
-        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", styles['Normal']))
+        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", normal))
+        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Diagnosis
-        diagnosis = random.choice(DIAGNOSES)
-        story.append(Paragraph(f"<b>Diagnosis:</b> {diagnosis}", styles['Normal']))
+        diagnosis = self._random.choice(DIAGNOSES)
+        story.append(Paragraph(f"<b>Diagnosis:</b> {diagnosis}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Prescription
-        story.append(Paragraph("<b>Rx (Prescription):</b>", styles['Heading2']))
-        num_medicines = random.randint(2, 5)
-        selected_meds = random.sample(MEDICINES, num_medicines)
+        story.append(Paragraph("<b>Rx (Prescription):</b>", h2))
+        num_medicines = self._random.randint(2, 5)
+        selected_meds = self._random.sample(MEDICINES, num_medicines)
         
         for i, med in enumerate(selected_meds, 1):
-            duration = random.choice(['5 days', '7 days', '10 days', '14 days'])
+            duration = self._random.choice(_DURATIONS)
             story.append(Paragraph(
                 f"{i}. {med['type']}. {med['name']} {med['strength']}<br/>"
                 f"   {med['dosage']} x {duration}",
-                styles['Normal']
+                normal
             ))
         
         story.append(Spacer(1, 0.2*inch))
         
         # Investigations
-        if random.random() > 0.5:
-            story.append(Paragraph("<b>Investigations Advised:</b>", styles['Heading2']))
-            num_tests = random.randint(1, 3)
-            for test in random.sample(TESTS, num_tests):
-                story.append(Paragraph(f"- {test['name']}", styles['Normal']))
+        if self._random.random() > 0.5:
+            story.append(Paragraph("<b>Investigations Advised:</b>", h2))
+            num_tests = self._random.randint(1, 3)
+            for test in self._random.sample(TESTS, num_tests):
+                story.append(Paragraph(f"- {test['name']}", normal))
         
         story.append(Spacer(1, 0.3*inch))
         
         # Follow-up
-        followup = date + timedelta(days=random.randint(7, 21))
-        story.append(Paragraph(f"<b>Follow-up:</b> {followup.strftime('%d/%m/%Y')}", styles['Normal']))
+        followup = date + timedelta(days=self._random.randint(7, 21))
+        story.append(Paragraph(f"<b>Follow-up:</b> {followup.strftime('%d/%m/%Y')}", normal))
         
         story.append(Spacer(1, 0.5*inch))
-        story.append(Paragraph(f"<i>{doctor['name']}</i>", styles['Normal']))
+        story.append(Paragraph(f"<i>{doctor['name']}</i>", normal))
         
         # Build PDF
-        doc.build(story)
+        _build_one(f'{self.output_dir}/{filename}', story)
         
         # Add noise if requested
         if add_noise:
@@ -168,62 +383,61 @@ class MedicalDocumentGenerator:
     
     def generate_medical_bill(self, filename='medical_bill.pdf', add_noise=False):
         """Generate a medical bill/invoice"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
+        h2 = styles['Heading2']
         
         # Header
-        header_style = ParagraphStyle(
-            'BillHeader',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#2c3e50'),
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        header_style = self._bill_header_style
         
-        clinic_name = random.choice(['City Hospital', 'HealthCare Clinic', 'MediPlus Hospital'])
+        clinic_name = self._random.choice(_CLINIC_NAMES)
         story.append(Paragraph(f"<b>{clinic_name}</b>", header_style))
-        story.append(Paragraph("Medical Bill/Invoice", styles['Heading2']))
+        story.append(Paragraph("Medical Bill/Invoice", h2))
         story.append(Spacer(1, 0.2*inch))
         
         # Bill details
-        bill_no = random.randint(10000, 99999)
-        date = datetime.now() - timedelta(days=random.randint(0, 30))
+        bill_no = self._random.randint(10000, 99999)
+        date = datetime.now() - timedelta(days=self._random.randint(0, 30))
         patient = self.generate_random_patient()
         
-        story.append(Paragraph(f"Bill No: <b>{bill_no}</b>  |  Date: <b>{date.strftime('%d/%m/%Y')}</b>", styles['Normal']))
+        story.append(Paragraph(_BILL_NO_TEMPLATE.format('', bill_no, date.strftime('%d/%m/%Y')), normal))
         story.append(Spacer(1, 0.2*inch))
         
-        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Contact:</b> {patient['contact']}", styles['Normal']))
+        story.append(Paragraph(_PATIENT_NAME_TEMPLATE.format(patient['name']), normal))
+        story.append(Paragraph(_CONTACT_TEMPLATE.format(patient['contact']), normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Bill items table
         data = [['S.No', 'Particulars', 'Amount (₹)']]
         
         # Consultation fee
-        consultation_fee = random.choice([500, 700, 1000, 1500])
+        consultation_fee = self._random.choice(_CONSULTATION_FEES)
         data.append(['1', 'Consultation Fee', f'{consultation_fee:.2f}'])
         
         subtotal = consultation_fee
         row_num = 2
+        append = data.append
         
         # Add tests
-        if random.random() > 0.3:
-            num_tests = random.randint(1, 3)
-            for test in random.sample(TESTS, num_tests):
-                data.append([str(row_num), test['name'], f'{test["price"]:.2f}'])
-                subtotal += test['price']
+        if self._random.random() > 0.3:
+            num_tests = int(self._rng.integers(1, 4))
+            for idx in self._rng.choice(len(TESTS), size=num_tests, replace=False).tolist():
+                test = TESTS[idx]
+                price = test['price']
+                append([str(row_num), test['name'], f'{price:.2f}'])
+                subtotal += price
                 row_num += 1
         
         # Add medicines
-        if random.random() > 0.4:
-            num_meds = random.randint(2, 4)
-            for med in random.sample(MEDICINES, num_meds):
-                qty = random.randint(5, 30)
+        if self._random.random() > 0.4:
+            num_meds = int(self._rng.integers(2, 5))
+            med_idx = self._rng.choice(len(MEDICINES), size=num_meds, replace=False).tolist()
+            qtys = self._rng.integers(5, 31, size=num_meds).tolist()
+            for idx, qty in zip(med_idx, qtys):
+                med = MEDICINES[idx]
                 amount = med['price'] * qty
-                data.append([str(row_num), f"{med['name']} {med['strength']} x{qty}", f'{amount:.2f}'])
+                append([str(row_num), f"{med['name']} {med['strength']} x{qty}", f'{amount:.2f}'])
                 subtotal += amount
                 row_num += 1
         
@@ -233,92 +447,198 @@ class MedicalDocumentGenerator:
         gst = subtotal * 0.18
         data.append(['', 'GST (18%):', f'{gst:.2f}'])
         total = subtotal + gst
-        data.append(['', '<b>TOTAL:</b>', f'<b>{total:.2f}</b>'])
+        data.append(['', 'TOTAL:', f'{total:.2f}'])
         
         # Create table
         table = Table(data, colWidths=[0.8*inch, 4*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -4), 1, colors.black),
-            ('LINEABOVE', (1, -3), (-1, -3), 1, colors.black),
-            ('LINEABOVE', (1, -1), (-1, -1), 2, colors.black),
-        ]))
+        table.setStyle(_BILL_TABLE_STYLE)
         
         story.append(table)
         story.append(Spacer(1, 0.3*inch))
         
         # Payment details
-        payment_mode = random.choice(['Cash', 'Card', 'UPI'])
-        story.append(Paragraph(f"<b>Payment Mode:</b> {payment_mode}", styles['Normal']))
+        payment_mode = self._random.choice(_PAYMENT_MODES)
+        story.append(Paragraph(_PAYMENT_MODE_TEMPLATE.format(payment_mode), normal))
         
         if payment_mode in ['Card', 'UPI']:
-            trans_id = ''.join(random.choices('0123456789ABCDEF', k=12))
-            story.append(Paragraph(f"<b>Transaction ID:</b> {trans_id}", styles['Normal']))
+            trans_id = self._rng.bytes(6).hex().upper()
+            story.append(Paragraph(_TRANSACTION_ID_TEMPLATE.format(trans_id), normal))
         
-        doc.build(story)
+        _build_one(f'{self.output_dir}/{filename}', story)
         
         if add_noise:
             self.add_noise_to_pdf(f'{self.output_dir}/{filename}')
         
         return f'{self.output_dir}/{filename}'
     
+    def generate_medical_bill_fast(self, filename='medical_bill_fast.pdf', add_noise=False):
+        """Generate a medical bill drawn straight onto the canvas at fixed coordinates (no flowable layout)"""
+        clinic_name = self._random.choice(_CLINIC_NAMES)
+        bill_no = self._random.randint(10000, 99999)
+        date = datetime.now() - timedelta(days=self._random.randint(0, 30))
+        patient = self.generate_random_patient()
+        
+        # Bill items
+        consultation_fee = self._random.choice(_CONSULTATION_FEES)
+        rows = [('1', 'Consultation Fee', consultation_fee)]
+        
+        if self._random.random() > 0.3:
+            num_tests = int(self._rng.integers(1, 4))
+            for idx in self._rng.choice(len(TESTS), size=num_tests, replace=False):
+                test = TESTS[idx]
+                rows.append((str(len(rows) + 1), test['name'], test['price']))
+        
+        if self._random.random() > 0.4:
+            num_meds = int(self._rng.integers(2, 5))
+            med_idx = self._rng.choice(len(MEDICINES), size=num_meds, replace=False)
+            qtys = self._rng.integers(5, 31, size=num_meds)
+            for idx, qty in zip(med_idx, qtys.tolist()):
+                med = MEDICINES[idx]
+                rows.append((str(len(rows) + 1), f"{med['name']} {med['strength']} x{qty}", med['price'] * qty))
+        
+        subtotal = sum(amount for _, _, amount in rows)
+        gst = subtotal * 0.18
+        total = subtotal + gst
+        
+        # Fixed layout - same column widths as the flowable bill
+        page_width, page_height = A4
+        left = (page_width - 6.3*inch) / 2
+        col_x = (left, left + 0.8*inch, left + 4.8*inch, left + 6.3*inch)
+        row_h = 20
+        pad = 6
+        
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=A4, pageCompression=1, invariant=1)
+        
+        def draw_row(y, cells):
+            c.drawString(col_x[0] + pad, y - 14, cells[0])
+            c.drawString(col_x[1] + pad, y - 14, cells[1])
+            c.drawRightString(col_x[3] - pad, y - 14, cells[2])
+        
+        # Header
+        y = page_height - inch
+        c.setFillColor(_NAVY)
+        c.setFont('Helvetica-Bold', 18)
+        c.drawCentredString(page_width / 2, y, clinic_name)
+        c.setFillColor(_BLACK)
+        y -= 32
+        c.setFont('Helvetica-Bold', 14)
+        c.drawString(left, y, "Medical Bill/Invoice")
+        
+        # Bill details
+        c.setFont('Helvetica', 10)
+        y -= 28
+        c.drawString(left, y, f"Bill No: {bill_no}  |  Date: {date.strftime('%d/%m/%Y')}")
+        y -= 24
+        c.drawString(left, y, f"Patient Name: {patient['name']}")
+        y -= 14
+        c.drawString(left, y, f"Contact: {patient['contact']}")
+        y -= 28
+        
+        # Table header
+        table_top = y
+        c.setFillColor(_HEADER_BG)
+        c.rect(col_x[0], y - row_h, col_x[3] - col_x[0], row_h, stroke=0, fill=1)
+        c.setFillColor(_WHITESMOKE)
+        c.setFont('Helvetica-Bold', 12)
+        draw_row(y, ('S.No', 'Particulars', 'Amount (₹)'))
+        y -= row_h
+        
+        # Item rows with full grid
+        c.setFillColor(_BLACK)
+        c.setFont('Helvetica', 10)
+        for s_no, particulars, amount in rows:
+            draw_row(y, (s_no, particulars, f'{amount:.2f}'))
+            y -= row_h
+        
+        c.setStrokeColor(_BLACK)
+        c.setLineWidth(1)
+        for i in range(len(rows) + 2):
+            line_y = table_top - i * row_h
+            c.line(col_x[0], line_y, col_x[3], line_y)
+        for x in col_x:
+            c.line(x, table_top, x, y)
+        
+        # Totals
+        y -= row_h
+        c.line(col_x[1], y, col_x[3], y)
+        draw_row(y, ('', 'Sub Total:', f'{subtotal:.2f}'))
+        y -= row_h
+        draw_row(y, ('', 'GST (18%):', f'{gst:.2f}'))
+        y -= row_h
+        c.setFillColor(_TOTAL_BG)
+        c.rect(col_x[0], y - row_h, col_x[3] - col_x[0], row_h, stroke=0, fill=1)
+        c.setFillColor(_BLACK)
+        c.setLineWidth(2)
+        c.line(col_x[1], y, col_x[3], y)
+        c.setFont('Helvetica-Bold', 10)
+        draw_row(y, ('', 'TOTAL:', f'{total:.2f}'))
+        y -= row_h
+        
+        # Payment details
+        payment_mode = self._random.choice(_PAYMENT_MODES)
+        c.setFont('Helvetica', 10)
+        y -= 28
+        c.drawString(left, y, f"Payment Mode: {payment_mode}")
+        if payment_mode in ['Card', 'UPI']:
+            y -= 14
+            c.drawString(left, y, f"Transaction ID: {self._rng.bytes(6).hex().upper()}")
+        
+        c.showPage()
+        c.save()
+        
+        path = f'{self.output_dir}/{filename}'
+        Path(path).write_bytes(buf.getvalue())
+        
+        if add_noise:
+            self.add_noise_to_pdf(path)
+        
+        return path
+        
     def generate_diagnostic_report(self, filename='diagnostic_report.pdf', add_noise=False):
         """Generate a diagnostic test report"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
+        h2 = styles['Heading2']
         
         # Header
         story.append(Paragraph("<b>DIAGNOSTIC CENTER</b>", styles['Title']))
-        story.append(Paragraph("NABL Accredited Lab", styles['Normal']))
+        story.append(Paragraph("NABL Accredited Lab", normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Patient details
         patient = self.generate_random_patient()
-        date = datetime.now() - timedelta(days=random.randint(0, 7))
-        report_id = f"RPT{random.randint(100000, 999999)}"
+        date = datetime.now() - timedelta(days=self._random.randint(0, 7))
+        report_id = f"RPT{self._random.randint(100000, 999999)}"
         
-        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Report ID:</b> {report_id}", styles['Normal']))
-        story.append(Paragraph(f"<b>Date:</b> {date.strftime('%d/%m/%Y')}", styles['Normal']))
+        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", normal))
+        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", normal))
+        story.append(Paragraph(f"<b>Report ID:</b> {report_id}", normal))
+        story.append(Paragraph(f"<b>Date:</b> {date.strftime('%d/%m/%Y')}", normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Test results
-        story.append(Paragraph("<b>COMPLETE BLOOD COUNT (CBC)</b>", styles['Heading2']))
+        story.append(Paragraph("<b>COMPLETE BLOOD COUNT (CBC)</b>", h2))
         
         # CBC results table
+        hb, wbc, rbc, plt = self._draw_panel('cbc')
         cbc_data = [
             ['Test Name', 'Result', 'Normal Range', 'Unit'],
-            ['Hemoglobin', f'{random.uniform(12, 16):.1f}', '13-17', 'g/dL'],
-            ['WBC Count', f'{random.randint(4000, 11000)}', '4000-11000', '/cumm'],
-            ['RBC Count', f'{random.uniform(4.5, 5.5):.2f}', '4.5-5.5', 'million/cumm'],
-            ['Platelets', f'{random.randint(150000, 450000)}', '150000-450000', '/cumm'],
+            ['Hemoglobin', f'{hb:.1f}', '13-17', 'g/dL'],
+            ['WBC Count', f'{int(wbc)}', '4000-11000', '/cumm'],
+            ['RBC Count', f'{rbc:.2f}', '4.5-5.5', 'million/cumm'],
+            ['Platelets', f'{int(plt)}', '150000-450000', '/cumm'],
         ]
         
         table = Table(cbc_data, colWidths=[2*inch, 1.2*inch, 1.5*inch, 1*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        table.setStyle(_CBC_TABLE_STYLE)
         
         story.append(table)
         story.append(Spacer(1, 0.5*inch))
-        story.append(Paragraph("<i>End of Report</i>", styles['Normal']))
+        story.append(Paragraph("<i>End of Report</i>", normal))
         
-        doc.build(story)
+        _build_one(f'{self.output_dir}/{filename}', story)
         
         if add_noise:
             self.add_noise_to_pdf(f'{self.output_dir}/{filename}')
@@ -329,88 +649,111 @@ class MedicalDocumentGenerator:
         """Convert PDF to image and add noise for OCR testing"""
         try:
             from pdf2image import convert_from_path
+            from PIL import Image as PILImage, ImageFilter
             images = convert_from_path(pdf_path, dpi=150)
+            base = Path(pdf_path)
+            
+            # Own generator per call - this runs on several threads at once via _add_noise_batch
+            rng = np.random.default_rng()
+            blur = ImageFilter.GaussianBlur(radius=0.5)
             
             for i, img in enumerate(images):
-                # Convert to numpy array
-                img_array = np.array(img)
-                
-                # Add Gaussian noise
-                noise = np.random.normal(0, 10, img_array.shape)
-                noisy_img = np.clip(img_array + noise, 0, 255).astype(np.uint8)
+                # Gaussian noise in float32, added and clipped in place
+                img_array = np.asarray(img, dtype=np.float32)
+                noisy = rng.standard_normal(img_array.shape, dtype=np.float32)
+                noisy *= 10
+                noisy += img_array
+                np.clip(noisy, 0, 255, out=noisy)
                 
                 # Convert back to PIL Image
-                noisy_pil = PILImage.fromarray(noisy_img)
+                noisy_pil = PILImage.fromarray(noisy.astype(np.uint8))
                 
                 # Apply slight blur
-                noisy_pil = noisy_pil.filter(ImageFilter.GaussianBlur(radius=0.5))
+                noisy_pil = noisy_pil.filter(blur)
                 
                 # Save
-                output_path = pdf_path.replace('.pdf', f'_noisy_page{i+1}.png')
+                output_path = str(base.with_name(f"{base.stem}_noisy_page{i+1}.png"))
                 noisy_pil.save(output_path)
                 print(f"Noisy image saved: {output_path}")
         except ImportError:
             print("pdf2image not installed. Skipping noise addition. Install with: pip install pdf2image")
     
+    def _add_noise_batch(self, pdf_paths):
+        """Add noise to several PDFs at once - poppler runs out of process, so threads overlap well"""
+        if not pdf_paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(4, len(pdf_paths))) as pool:
+            list(pool.map(self.add_noise_to_pdf, pdf_paths))
+    
     def generate_pharmacy_bill(self, filename='pharmacy_bill.pdf', patient_info=None, medicines_list=None, add_noise=False):
         """Generate a pharmacy bill"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
+        path = f'{self.output_dir}/{filename}'
+        _build_one(path, self._pharmacy_bill_story(patient_info, medicines_list))
+        
+        if add_noise:
+            self.add_noise_to_pdf(path)
+        
+        return path
+    
+    def _pharmacy_bill_story(self, patient_info, medicines_list, now=None):
+        """Build pharmacy bill flowables"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
         
         # Header
-        header_style = ParagraphStyle(
-            'PharmacyHeader',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#16a085'),
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        header_style = self._pharmacy_header_style
         
-        pharmacy_name = random.choice(['MedPlus Pharmacy', 'Apollo Pharmacy', 'NetMeds Retail'])
+        pharmacy_name = self._random.choice(_PHARMACY_NAMES)
         story.append(Paragraph(f"<b>{pharmacy_name}</b>", header_style))
-        story.append(Paragraph("Licensed Retail Pharmacy", styles['Normal']))
+        story.append(Paragraph("Licensed Retail Pharmacy", normal))
         
         # License details
-        license_no = f"DL-{random.randint(10000, 99999)}"
-        gst_no = f"{random.randint(10, 99)}XXXXX{random.randint(1000, 9999)}Z{random.randint(1, 9)}"
-        story.append(Paragraph(f"Drug License No: {license_no}", styles['Normal']))
-        story.append(Paragraph(f"GST No: {gst_no}", styles['Normal']))
+        license_no = f"DL-{self._random.randint(10000, 99999)}"
+        gst_no = f"{self._random.randint(10, 99)}XXXXX{self._random.randint(1000, 9999)}Z{self._random.randint(1, 9)}"
+        story.append(Paragraph(f"Drug License No: {license_no}", normal))
+        story.append(Paragraph(f"GST No: {gst_no}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Bill details
-        bill_no = random.randint(10000, 99999)
-        date = datetime.now() - timedelta(days=random.randint(0, 30))
+        bill_no = self._random.randint(10000, 99999)
+        date = (now or datetime.now()) - timedelta(days=self._random.randint(0, 30))
         
         if patient_info is None:
             patient_info = self.generate_random_patient()
         
-        story.append(Paragraph(f"Bill No: <b>PH-{bill_no}</b>  |  Date: <b>{date.strftime('%d/%m/%Y %H:%M')}</b>", styles['Normal']))
+        story.append(Paragraph(f"Bill No: <b>PH-{bill_no}</b>  |  Date: <b>{date.strftime('%d/%m/%Y %H:%M')}</b>", normal))
         story.append(Spacer(1, 0.2*inch))
         
-        story.append(Paragraph(f"<b>Customer:</b> {patient_info['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Contact:</b> {patient_info['contact']}", styles['Normal']))
+        story.append(Paragraph(f"<b>Customer:</b> {patient_info['name']}", normal))
+        story.append(Paragraph(f"<b>Contact:</b> {patient_info['contact']}", normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Medicines table
         data = [['S.No', 'Medicine Name', 'Batch', 'Exp', 'Qty', 'MRP', 'Amount']]
         
         if medicines_list is None:
-            medicines_list = random.sample(MEDICINES, random.randint(2, 5))
+            medicines_list = self._random.sample(MEDICINES, self._random.randint(2, 5))
+        
+        n = len(medicines_list)
+        batch_nos = self._rng.integers(100, 1000, size=n).tolist()
+        exp_months = self._rng.integers(1, 13, size=n).tolist()
+        exp_years = self._rng.integers(25, 28, size=n).tolist()
+        qtys = self._rng.integers(5, 31, size=n).tolist()
         
         subtotal = 0
-        for i, med in enumerate(medicines_list, 1):
-            batch = f"{random.choice(['AB', 'CD', 'XY'])}{random.randint(100, 999)}"
-            exp_month = random.randint(1, 12)
-            exp_year = random.randint(25, 27)
+        append = data.append
+        choice = self._random.choice
+        for i, (med, batch_no, exp_month, exp_year, qty) in enumerate(
+            zip(medicines_list, batch_nos, exp_months, exp_years, qtys), 1
+        ):
+            batch = f"{choice(_BATCH_PREFIXES)}{batch_no}"
             exp_date = f"{exp_month:02d}/{exp_year}"
-            qty = random.randint(5, 30)
             mrp = med['price']
             amount = mrp * qty
             subtotal += amount
             
-            data.append([
+            append([
                 str(i),
                 f"{med['name']} {med['strength']}",
                 batch,
@@ -424,7 +767,7 @@ class MedicalDocumentGenerator:
         data.append(['', '', '', '', '', '', ''])
         data.append(['', '', '', '', '', 'Sub Total:', f'₹{subtotal}'])
         
-        discount = subtotal * random.choice([0, 0.05, 0.10])
+        discount = subtotal * self._random.choice(_PHARMACY_DISCOUNTS)
         if discount > 0:
             data.append(['', '', '', '', '', 'Discount:', f'-₹{discount:.2f}'])
             subtotal -= discount
@@ -432,45 +775,37 @@ class MedicalDocumentGenerator:
         gst = subtotal * 0.12  # 12% GST for medicines
         data.append(['', '', '', '', '', 'GST (12%):', f'₹{gst:.2f}'])
         total = subtotal + gst
-        data.append(['', '', '', '', '', '<b>Net Amount:</b>', f'<b>₹{total:.2f}</b>'])
+        data.append(['', '', '', '', '', 'Net Amount:', f'₹{total:.2f}'])
         
         # Create table
         table = Table(data, colWidths=[0.5*inch, 2*inch, 0.7*inch, 0.7*inch, 0.5*inch, 0.8*inch, 1*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#16a085')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-            ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -len(data)+6), 1, colors.black),
-            ('LINEABOVE', (5, -5), (-1, -5), 1, colors.black),
-            ('LINEABOVE', (5, -1), (-1, -1), 2, colors.black),
-        ]))
+        table.setStyle(TableStyle(
+            _PHARMACY_TABLE_STYLE_CMDS
+            + [('GRID', (0, 0), (-1, -len(data)+6), 1, _BLACK)]
+            + _PHARMACY_TOTAL_LINE_CMDS
+        ))
         
         story.append(table)
         story.append(Spacer(1, 0.3*inch))
         
         # Payment details
-        payment_mode = random.choice(['Cash', 'Card', 'UPI', 'Digital Wallet'])
-        story.append(Paragraph(f"<b>Payment Mode:</b> {payment_mode}", styles['Normal']))
+        payment_mode = self._random.choice(_PHARMACY_PAYMENT_MODES)
+        story.append(Paragraph(f"<b>Payment Mode:</b> {payment_mode}", normal))
         
         story.append(Spacer(1, 0.2*inch))
-        story.append(Paragraph("<i>Thank you for your purchase!</i>", styles['Normal']))
-        story.append(Paragraph("<i>Keep medicines away from children</i>", styles['Normal']))
-        
-        doc.build(story)
+        story.append(Paragraph("<i>Thank you for your purchase!</i>", normal))
+        story.append(Paragraph("<i>Keep medicines away from children</i>", normal))
         
-        if add_noise:
-            self.add_noise_to_pdf(f'{self.output_dir}/{filename}')
-        
-        return f'{self.output_dir}/{filename}'
+        return story
+
+    def _render_documents(self, directory, pending):
+        """Build and render (path, story_builder, args) jobs in memory, then write them together.
+        Runs serially - story building and doc.build are CPU-bound Python, so threads only add GIL
+        contention; batches get their parallelism from worker processes instead"""
+        rendered = [_render(story_builder(*args)) for _, story_builder, args in pending]
+        _write_files(directory, zip([path for path, _, _ in pending], rendered))
     
-    def generate_complete_claimant_set(self, claimant_name=None, claimant_folder=None, add_noise=False):
+    def generate_complete_claimant_set(self, claimant_name=None, claimant_folder=None, add_noise=False, verbose=True, now=None):
         """Generate all 4 documents for a single claimant"""
         # Generate or use provided patient info
         if claimant_name:
@@ -484,64 +819,41 @@ class MedicalDocumentGenerator:
             claimant_folder = patient['name'].replace(' ', '_')
         
         claimant_path = f"{self.output_dir}/{claimant_folder}"
-        import os
-        os.makedirs(claimant_path, exist_ok=True)
-        
-        # Store original output_dir
-        original_output = self.output_dir
-        self.output_dir = claimant_path
+        _ensure_dir(claimant_path)
         
-        print(f"\n{'='*60}")
-        print(f"Generating documents for: {patient['name']}")
-        print(f"{'='*60}")
+        if verbose:
+            print(f"\n{'='*60}\nGenerating documents for: {patient['name']}\n{'='*60}")
         
         # Select medicines and tests (to be consistent across documents)
-        selected_medicines = random.sample(MEDICINES, random.randint(3, 5))
-        selected_tests = random.sample(TESTS, random.randint(1, 3))
-        diagnosis = random.choice(DIAGNOSES)
-        
-        # 1. Generate Prescription
-        print("  [1/4] Generating Prescription...")
-        prescription_path = self.generate_prescription_for_claimant(
-            'prescription.pdf', 
-            patient, 
-            selected_medicines, 
-            selected_tests,
-            diagnosis,
-            add_noise
-        )
-        
-        # 2. Generate Lab Results
-        print("  [2/4] Generating Lab Results...")
-        lab_path = self.generate_diagnostic_report_for_claimant(
-            'lab_results.pdf',
-            patient,
-            selected_tests,
-            add_noise
-        )
-        
-        # 3. Generate Medical Bill
-        print("  [3/4] Generating Medical Bill...")
-        medical_bill_path = self.generate_medical_bill_for_claimant(
-            'medical_bill.pdf',
-            patient,
-            selected_tests,
-            add_noise
-        )
-        
-        # 4. Generate Pharmacy Bill
-        print("  [4/4] Generating Pharmacy Bill...")
-        pharmacy_bill_path = self.generate_pharmacy_bill(
-            'pharmacy_bill.pdf',
-            patient,
-            selected_medicines,
-            add_noise
-        )
+        selected_medicines = self._random.sample(MEDICINES, self._random.randint(3, 5))
+        selected_tests = self._random.sample(TESTS, self._random.randint(1, 3))
+        diagnosis = self._random.choice(DIAGNOSES)
+        
+        # One clock read for the whole set; document dates are offsets from it
+        now = now or datetime.now()
+        
+        prescription_path = f'{claimant_path}/prescription.pdf'
+        lab_path = f'{claimant_path}/lab_results.pdf'
+        medical_bill_path = f'{claimant_path}/medical_bill.pdf'
+        pharmacy_bill_path = f'{claimant_path}/pharmacy_bill.pdf'
+        
+        # Each document is built and rendered in memory, then all four are written together
+        if verbose:
+            print("  [1/4] Prescription  [2/4] Lab Results  [3/4] Medical Bill  [4/4] Pharmacy Bill")
+        pending = [
+            (prescription_path, self._prescription_story,
+             (patient, selected_medicines, selected_tests, diagnosis, now)),
+            (lab_path, self._diagnostic_report_story, (patient, selected_tests, now)),
+            (medical_bill_path, self._medical_bill_story, (patient, selected_tests, now)),
+            (pharmacy_bill_path, self._pharmacy_bill_story, (patient, selected_medicines, now)),
+        ]
+        self._render_documents(claimant_path, pending)
         
-        # Restore original output_dir
-        self.output_dir = original_output
+        if add_noise:
+            self._add_noise_batch([path for path, _, _ in pending])
         
-        print(f"✓ Complete set generated in: {claimant_path}/")
+        if verbose:
+            print(f"✓ Complete set generated in: {claimant_path}/")
         
         return {
             'claimant': patient['name'],
@@ -556,118 +868,130 @@ class MedicalDocumentGenerator:
     
     def generate_prescription_for_claimant(self, filename, patient, medicines, tests, diagnosis, add_noise):
         """Generate prescription with specific patient and medicines"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
+        path = f'{self.output_dir}/{filename}'
+        _build_one(path, self._prescription_story(patient, medicines, tests, diagnosis))
+        
+        if add_noise:
+            self.add_noise_to_pdf(path)
+        
+        return path
+    
+    def _prescription_story(self, patient, medicines, tests, diagnosis, now=None):
+        """Build prescription flowables for a specific patient"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
+        h2 = styles['Heading2']
         
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a5490'),
-            spaceAfter=12,
-            alignment=TA_CENTER
-        )
+        header_style = self._prescription_header_style
         
-        doctor = random.choice(DOCTORS)
+        doctor = self._random.choice(DOCTORS)
         reg_no = self.generate_registration_number()
         
         # Header
         story.append(Paragraph(f"<b>{doctor['name']}</b>", header_style))
-        story.append(Paragraph(doctor['qualification'], styles['Normal']))
-        story.append(Paragraph(f"Reg. No: {reg_no}", styles['Normal']))
-        story.append(Paragraph(f"Specialty: {doctor['specialty']}", styles['Normal']))
+        story.append(Paragraph(doctor['qualification'], normal))
+        story.append(Paragraph(f"Reg. No: {reg_no}", normal))
+        story.append(Paragraph(f"Specialty: {doctor['specialty']}", normal))
         story.append(Spacer(1, 0.3*inch))
         
-        date = datetime.now() - timedelta(days=random.randint(0, 7))
-        story.append(Paragraph(f"Date: {date.strftime('%d/%m/%Y')}", styles['Normal']))
+        date = (now or datetime.now()) - timedelta(days=self._random.randint(0, 7))
+        story.append(Paragraph(f"Date: {date.strftime('%d/%m/%Y')}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Patient Details
-        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Contact:</b> {patient['contact']}", styles['Normal']))
+        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", normal))
+        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", normal))
+        story.append(Paragraph(f"<b>Contact:</b> {patient['contact']}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Diagnosis
-        story.append(Paragraph(f"<b>Diagnosis:</b> {diagnosis}", styles['Normal']))
+        story.append(Paragraph(f"<b>Diagnosis:</b> {diagnosis}", normal))
         story.append(Spacer(1, 0.2*inch))
         
         # Prescription
-        story.append(Paragraph("<b>Rx (Prescription):</b>", styles['Heading2']))
+        story.append(Paragraph("<b>Rx (Prescription):</b>", h2))
         for i, med in enumerate(medicines, 1):
-            duration = random.choice(['5 days', '7 days', '10 days', '14 days'])
+            duration = self._random.choice(_DURATIONS)
             story.append(Paragraph(
                 f"{i}. {med['type']}. {med['name']} {med['strength']}<br/>"
                 f"   {med['dosage']} x {duration}",
-                styles['Normal']
+                normal
             ))
         
         story.append(Spacer(1, 0.2*inch))
         
         # Investigations
-        story.append(Paragraph("<b>Investigations Advised:</b>", styles['Heading2']))
+        story.append(Paragraph("<b>Investigations Advised:</b>", h2))
         for test in tests:
-            story.append(Paragraph(f"- {test['name']}", styles['Normal']))
+            story.append(Paragraph(f"- {test['name']}", normal))
         
         story.append(Spacer(1, 0.3*inch))
         followup = date + timedelta(days=14)
-        story.append(Paragraph(f"<b>Follow-up:</b> {followup.strftime('%d/%m/%Y')}", styles['Normal']))
+        story.append(Paragraph(f"<b>Follow-up:</b> {followup.strftime('%d/%m/%Y')}", normal))
         
         story.append(Spacer(1, 0.5*inch))
-        story.append(Paragraph(f"<i>{doctor['name']}</i>", styles['Normal']))
+        story.append(Paragraph(f"<i>{doctor['name']}</i>", normal))
         
-        doc.build(story)
+        return story
+
+    def generate_diagnostic_report_for_claimant(self, filename, patient, tests, add_noise):
+        """Generate diagnostic report for specific patient and tests"""
+        path = f'{self.output_dir}/{filename}'
+        _build_one(path, self._diagnostic_report_story(patient, tests))
         
         if add_noise:
-            self.add_noise_to_pdf(f'{self.output_dir}/{filename}')
+            self.add_noise_to_pdf(path)
         
-        return f'{self.output_dir}/{filename}'
+        return path
     
-    def generate_diagnostic_report_for_claimant(self, filename, patient, tests, add_noise):
-        """Generate diagnostic report for specific patient and tests"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
+    def _diagnostic_report_story(self, patient, tests, now=None):
+        """Build diagnostic report flowables for a specific patient"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
+        h2 = styles['Heading2']
         
         story.append(Paragraph("<b>DIAGNOSTIC CENTER</b>", styles['Title']))
-        story.append(Paragraph("NABL Accredited Lab", styles['Normal']))
+        story.append(Paragraph("NABL Accredited Lab", normal))
         story.append(Spacer(1, 0.3*inch))
         
-        date = datetime.now() - timedelta(days=random.randint(0, 5))
-        report_id = f"RPT{random.randint(100000, 999999)}"
+        date = (now or datetime.now()) - timedelta(days=self._random.randint(0, 5))
+        report_id = f"RPT{self._random.randint(100000, 999999)}"
         
-        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Contact:</b> {patient['contact']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Report ID:</b> {report_id}", styles['Normal']))
-        story.append(Paragraph(f"<b>Date:</b> {date.strftime('%d/%m/%Y')}", styles['Normal']))
+        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", normal))
+        story.append(Paragraph(f"<b>Age/Sex:</b> {patient['age']}/{patient['sex']}", normal))
+        story.append(Paragraph(f"<b>Contact:</b> {patient['contact']}", normal))
+        story.append(Paragraph(f"<b>Report ID:</b> {report_id}", normal))
+        story.append(Paragraph(f"<b>Date:</b> {date.strftime('%d/%m/%Y')}", normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Generate results for each test
         for test in tests:
-            story.append(Paragraph(f"<b>{test['name'].upper()}</b>", styles['Heading2']))
+            story.append(Paragraph(f"<b>{test['name'].upper()}</b>", h2))
             
             if 'CBC' in test['name'] or 'Blood Count' in test['name']:
+                hb, wbc, rbc, plt = self._draw_panel('cbc')
                 cbc_data = [
                     ['Test Name', 'Result', 'Normal Range', 'Unit'],
-                    ['Hemoglobin', f'{random.uniform(12, 16):.1f}', '13-17', 'g/dL'],
-                    ['WBC Count', f'{random.randint(4000, 11000)}', '4000-11000', '/cumm'],
-                    ['RBC Count', f'{random.uniform(4.5, 5.5):.2f}', '4.5-5.5', 'million/cumm'],
-                    ['Platelets', f'{random.randint(150000, 450000)}', '150000-450000', '/cumm'],
+                    ['Hemoglobin', f'{hb:.1f}', '13-17', 'g/dL'],
+                    ['WBC Count', f'{int(wbc)}', '4000-11000', '/cumm'],
+                    ['RBC Count', f'{rbc:.2f}', '4.5-5.5', 'million/cumm'],
+                    ['Platelets', f'{int(plt)}', '150000-450000', '/cumm'],
                 ]
             elif 'Lipid' in test['name']:
+                total_chol, hdl, ldl, trig = self._draw_panel('lipid')
                 cbc_data = [
                     ['Test Name', 'Result', 'Normal Range', 'Unit'],
-                    ['Total Cholesterol', f'{random.randint(150, 240)}', '<200', 'mg/dL'],
-                    ['HDL Cholesterol', f'{random.randint(40, 60)}', '>40', 'mg/dL'],
-                    ['LDL Cholesterol', f'{random.randint(70, 160)}', '<100', 'mg/dL'],
-                    ['Triglycerides', f'{random.randint(80, 180)}', '<150', 'mg/dL'],
+                    ['Total Cholesterol', f'{total_chol}', '<200', 'mg/dL'],
+                    ['HDL Cholesterol', f'{hdl}', '>40', 'mg/dL'],
+                    ['LDL Cholesterol', f'{ldl}', '<100', 'mg/dL'],
+                    ['Triglycerides', f'{trig}', '<150', 'mg/dL'],
                 ]
             elif 'Sugar' in test['name'] or 'Blood Sugar' in test['name']:
                 cbc_data = [
                     ['Test Name', 'Result', 'Normal Range', 'Unit'],
-                    ['Fasting Blood Sugar', f'{random.randint(80, 126)}', '70-100', 'mg/dL'],
+                    ['Fasting Blood Sugar', f"{self._draw_panel('sugar')[0]}", '70-100', 'mg/dL'],
                 ]
             else:
                 cbc_data = [
@@ -676,139 +1000,197 @@ class MedicalDocumentGenerator:
                 ]
             
             table = Table(cbc_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            table.setStyle(_LAB_TABLE_STYLE)
             
             story.append(table)
             story.append(Spacer(1, 0.3*inch))
         
-        story.append(Paragraph("<i>End of Report</i>", styles['Normal']))
+        story.append(Paragraph("<i>End of Report</i>", normal))
         
-        doc.build(story)
+        return story
+
+    def generate_medical_bill_for_claimant(self, filename, patient, tests, add_noise):
+        """Generate medical bill for specific patient and tests"""
+        path = f'{self.output_dir}/{filename}'
+        _build_one(path, self._medical_bill_story(patient, tests))
         
         if add_noise:
-            self.add_noise_to_pdf(f'{self.output_dir}/{filename}')
+            self.add_noise_to_pdf(path)
         
-        return f'{self.output_dir}/{filename}'
+        return path
     
-    def generate_medical_bill_for_claimant(self, filename, patient, tests, add_noise):
-        """Generate medical bill for specific patient and tests"""
-        doc = SimpleDocTemplate(f'{self.output_dir}/{filename}', pagesize=A4)
+    def _medical_bill_story(self, patient, tests, now=None):
+        """Build medical bill flowables for a specific patient"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = self._styles
+        normal = styles['Normal']
+        h2 = styles['Heading2']
         
-        header_style = ParagraphStyle(
-            'BillHeader',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#2c3e50'),
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        header_style = self._bill_header_style
         
-        clinic_name = random.choice(['City Hospital', 'HealthCare Clinic', 'MediPlus Hospital'])
+        clinic_name = self._random.choice(_CLINIC_NAMES)
         story.append(Paragraph(f"<b>{clinic_name}</b>", header_style))
-        story.append(Paragraph("Medical Bill/Invoice", styles['Heading2']))
+        story.append(Paragraph("Medical Bill/Invoice", h2))
         story.append(Spacer(1, 0.2*inch))
         
-        bill_no = random.randint(10000, 99999)
-        date = datetime.now() - timedelta(days=random.randint(0, 7))
+        bill_no = self._random.randint(10000, 99999)
+        date = (now or datetime.now()) - timedelta(days=self._random.randint(0, 7))
         
-        story.append(Paragraph(f"Bill No: <b>MB-{bill_no}</b>  |  Date: <b>{date.strftime('%d/%m/%Y')}</b>", styles['Normal']))
+        story.append(Paragraph(_BILL_NO_TEMPLATE.format('MB-', bill_no, date.strftime('%d/%m/%Y')), normal))
         story.append(Spacer(1, 0.2*inch))
         
-        story.append(Paragraph(f"<b>Patient Name:</b> {patient['name']}", styles['Normal']))
-        story.append(Paragraph(f"<b>Contact:</b> {patient['contact']}", styles['Normal']))
+        story.append(Paragraph(_PATIENT_NAME_TEMPLATE.format(patient['name']), normal))
+        story.append(Paragraph(_CONTACT_TEMPLATE.format(patient['contact']), normal))
         story.append(Spacer(1, 0.3*inch))
         
         # Bill items table
         data = [['S.No', 'Particulars', 'Amount (₹)']]
         
-        consultation_fee = random.choice([500, 700, 1000, 1500])
+        consultation_fee = self._random.choice(_CONSULTATION_FEES)
         data.append(['1', 'Consultation Fee', f'{consultation_fee:.2f}'])
         
-        subtotal = consultation_fee
-        row_num = 2
-        
-        for test in tests:
-            data.append([str(row_num), test['name'], f'{test["price"]:.2f}'])
-            subtotal += test['price']
-            row_num += 1
+        prices = [test['price'] for test in tests]
+        data.extend([str(i), test['name'], f'{price:.2f}'] for i, (test, price) in enumerate(zip(tests, prices), start=2))
+        subtotal = consultation_fee + sum(prices)
         
         data.append(['', '', ''])
         data.append(['', 'Sub Total:', f'{subtotal:.2f}'])
         gst = subtotal * 0.18
         data.append(['', 'GST (18%):', f'{gst:.2f}'])
         total = subtotal + gst
-        data.append(['', '<b>TOTAL:</b>', f'<b>{total:.2f}</b>'])
+        data.append(['', 'TOTAL:', f'{total:.2f}'])
         
         table = Table(data, colWidths=[0.8*inch, 4*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -4), 1, colors.black),
-            ('LINEABOVE', (1, -3), (-1, -3), 1, colors.black),
-            ('LINEABOVE', (1, -1), (-1, -1), 2, colors.black),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
-        ]))
+        table.setStyle(_CLAIMANT_BILL_TABLE_STYLE)
         
         story.append(table)
         story.append(Spacer(1, 0.3*inch))
         
-        payment_mode = random.choice(['Cash', 'Card', 'UPI'])
-        story.append(Paragraph(f"<b>Payment Mode:</b> {payment_mode}", styles['Normal']))
+        payment_mode = self._random.choice(_PAYMENT_MODES)
+        story.append(Paragraph(_PAYMENT_MODE_TEMPLATE.format(payment_mode), normal))
         
-        doc.build(story)
-        
-        if add_noise:
-            self.add_noise_to_pdf(f'{self.output_dir}/{filename}')
+        return story
+
+    def _fork_batch(self, tasks, jobs):
+        """Linux fast path - fork one child per claimant, up to jobs at a time, sharing this generator copy-on-write"""
+        results = [None] * len(tasks)
+        
+        for start in range(0, len(tasks), jobs):
+            children = []
+            sys.stdout.flush()
+            for index in range(start, min(start + jobs, len(tasks))):
+                read_fd, write_fd = os.pipe()
+                pid = os.fork()
+                if pid == 0:
+                    # Child: reseed so siblings don't repeat the parent's random stream
+                    os.close(read_fd)
+                    status = 1
+                    try:
+                        self._random.seed()
+                        self._rng = np.random.default_rng()
+                        _, claimant_name, claimant_folder, add_noise, verbose, now = tasks[index]
+                        result = self.generate_complete_claimant_set(
+                            claimant_name=claimant_name,
+                            claimant_folder=claimant_folder,
+                            add_noise=add_noise,
+                            verbose=verbose,
+                            now=now
+                        )
+                        with os.fdopen(write_fd, 'wb') as pipe:
+                            pickle.dump(result, pipe)
+                        status = 0
+                    except BaseException:
+                        # os._exit skips the normal handler, so surface the child's traceback here
+                        traceback.print_exc()
+                    finally:
+                        sys.stdout.flush()
+                        os._exit(status)
+                
+                os.close(write_fd)
+                children.append((index, pid, read_fd))
+            
+            # Results are small dicts, so reading each pipe before waitpid cannot block the child.
+            # Every child is read and reaped before raising so no fds or zombies are left behind.
+            failed = []
+            for index, pid, read_fd in children:
+                with os.fdopen(read_fd, 'rb') as pipe:
+                    data = pipe.read()
+                _, status = os.waitpid(pid, 0)
+                if status != 0 or not data:
+                    failed.append(tasks[index][1])
+                else:
+                    results[index] = pickle.loads(data)
+            
+            if failed:
+                raise RuntimeError(f"Document generation failed for claimant(s): {', '.join(failed)}")
         
-        return f'{self.output_dir}/{filename}'
+        return results
     
-    def generate_batch_claimants(self, num_claimants=5, claimant_names=None, add_noise=False):
+    def generate_batch_claimants(self, num_claimants=5, claimant_names=None, add_noise=False, jobs=None, verbose=True):
         """Generate complete document sets for multiple claimants"""
-        results = []
-        
-        print(f"\n{'#'*60}")
-        print(f"  GENERATING DOCUMENTS FOR {num_claimants} CLAIMANTS")
-        print(f"{'#'*60}")
+        if verbose:
+            print(f"\n{'#'*60}\n  GENERATING DOCUMENTS FOR {num_claimants} CLAIMANTS\n{'#'*60}")
         
+        # Resolve names and folders up front so parallel workers never share a folder
+        batch_now = datetime.now()
+        tasks = []
+        used_folders = set()
         for i in range(num_claimants):
             if claimant_names and i < len(claimant_names):
                 claimant_name = claimant_names[i]
             else:
-                claimant_name = None
+                claimant_name = self._random.choice(PATIENT_NAMES)
             
-            result = self.generate_complete_claimant_set(
-                claimant_name=claimant_name,
-                add_noise=add_noise
-            )
-            results.append(result)
-        
-        print(f"\n{'#'*60}")
-        print(f"  ✓ ALL DOCUMENTS GENERATED SUCCESSFULLY")
-        print(f"{'#'*60}\n")
-        
-        # Print summary
-        print("SUMMARY:")
-        for result in results:
-            print(f"\n  Claimant: {result['claimant']}")
-            print(f"  Folder: {result['folder']}")
-            print(f"    - Prescription: ✓")
-            print(f"    - Lab Results: ✓")
-            print(f"    - Medical Bill: ✓")
-            print(f"    - Pharmacy Bill: ✓")
+            folder = base_folder = claimant_name.replace(' ', '_')
+            suffix = 2
+            while folder in used_folders:
+                folder = f"{base_folder}_{suffix}"
+                suffix += 1
+            used_folders.add(folder)
+            tasks.append((self.output_dir, claimant_name, folder, add_noise, verbose, batch_now))
+        
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1 or num_claimants <= 1:
+            results = [_worker(task) for task in tasks]
+        elif sys.platform == 'linux':
+            results = self._fork_batch(tasks, min(jobs, num_claimants))
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, num_claimants)) as ex:
+                results = list(ex.map(_worker, tasks))
+        
+        if verbose:
+            # Build the summary as one string so it goes out in a single write
+            summary = io.StringIO()
+            summary.write(f"\n{'#'*60}\n  ✓ ALL DOCUMENTS GENERATED SUCCESSFULLY\n{'#'*60}\n\n")
+            summary.write("SUMMARY:\n")
+            for result in results:
+                summary.write(
+                    f"\n  Claimant: {result['claimant']}\n"
+                    f"  Folder: {result['folder']}\n"
+                    f"    - Prescription: ✓\n"
+                    f"    - Lab Results: ✓\n"
+                    f"    - Medical Bill: ✓\n"
+                    f"    - Pharmacy Bill: ✓\n"
+                )
+            sys.stdout.write(summary.getvalue())
         
         return results
 
 
+
+def _worker(task):
+    """Process-pool entry point - builds one claimant set with a per-process generator"""
+    output_dir, claimant_name, claimant_folder, add_noise, verbose, now = task
+    generator = MedicalDocumentGenerator(output_dir=output_dir)
+    return generator.generate_complete_claimant_set(
+        claimant_name=claimant_name,
+        claimant_folder=claimant_folder,
+        add_noise=add_noise,
+        verbose=verbose,
+        now=now
+    )
+
+
 # Example usage
 if __name__ == "__main__":
     generator = MedicalDocumentGenerator(output_dir='medical_docs')
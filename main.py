@@ -4,11 +4,18 @@ Flask Application Entry Point for Medical Claim Adjudication System
 from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
+import logging
 import os
 
 # Load environment variables
 load_dotenv()
 
+# Document read/extract tracing is logged at DEBUG; set LOG_LEVEL=DEBUG to see it
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+)
+
 # Import API blueprint
 from api import api_blueprint
 